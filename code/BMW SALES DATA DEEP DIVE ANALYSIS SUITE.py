@@ -3,520 +3,29 @@
 # =============================================================================
 # Professional analysis of BMW sales data (2010-2024) with
 # SQL integration, multi-format exports, and automated reporting.
+# Shared pipeline steps live in bmw_core.py.
 # =============================================================================
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import sqlite3
-import os
-from datetime import datetime
-from matplotlib.backends.backend_pdf import PdfPages
-from matplotlib.patches import Rectangle
-import warnings
-from scipy import stats
-from scipy.stats import linregress
+from bmw_core import (OUTPUT_DIR, configure_runtime, prepare, render_static,
+                      save_excel, generate_pdf_report, print_summary)
 
-warnings.filterwarnings('ignore')
 
-# =========================
-# SETTINGS
-# =========================
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+def main():
+    configure_runtime()
+    df, queries, metrics = prepare("BMW SALES DATA DEEP DIVE ANALYSIS")
 
-script_dir = os.path.dirname(__file__)
-OUTPUT_DIR = os.path.join(script_dir, "BMW_Sales_Analysis_Results")
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+    images = render_static(df, queries, metrics, OUTPUT_DIR)
+    save_excel(df, queries, metrics, OUTPUT_DIR)
+    generate_pdf_report(df, metrics, OUTPUT_DIR, images=images)
 
-# Base filename (without extension)
-BASE_NAME = "BMW sales data (2010-2024) (1)"
-# Try with .csv first, then without
-CSV_FILE_CANDIDATES = [
-    os.path.join(script_dir, BASE_NAME + ".csv"),
-    os.path.join(script_dir, BASE_NAME)
-]
-CSV_FILE = None
-for candidate in CSV_FILE_CANDIDATES:
-    if os.path.exists(candidate):
-        CSV_FILE = candidate
-        break
+    print_summary(df, metrics, [
+        "📊 1. Excel: BMW_Sales_Comprehensive_Analysis.xlsx",
+        "📈 2. PNG Dashboard: BMW_Sales_Dashboard.png",
+        "📄 3. PDF Report: BMW_Sales_Analysis_Report_[timestamp].pdf",
+        "🗃️  4. SQLite Database: BMW_Sales.db",
+        "🖼️  5. Additional charts: Fuel_Region_Heatmap.png, Price_by_Segment.png",
+    ])
 
-if CSV_FILE is None:
-    print("\n" + "="*60)
-    print("ERROR: BMW data file not found!")
-    print("="*60)
-    print(f"Expected one of:")
-    for c in CSV_FILE_CANDIDATES:
-        print(f"  {c}")
-    print("\nPlease copy your file to this folder and ensure it is named")
-    print(f"  {BASE_NAME}  or  {BASE_NAME}.csv")
-    print("="*60)
-    exit(1)
 
-DB_FILE = os.path.join(OUTPUT_DIR, "BMW_Sales.db")
-
-print("=" * 60)
-print("BMW SALES DATA DEEP DIVE ANALYSIS")
-print("=" * 60)
-
-# =========================
-# LOAD DATA
-# =========================
-
-
-def load_data(file_path):
-    print("\n1. DATA OVERVIEW")
-    print("-" * 40)
-    df = pd.read_csv(file_path)
-    print(f"Dataset shape: {df.shape}")
-    print(f"Total records: {df.shape[0]:,}")
-    print(f"Total sales volume: {df['Sales_Volume'].sum():,}")
-    return df
-
-
-df = load_data(CSV_FILE)
-
-# =========================
-# INITIAL CLEANING & METRICS
-# =========================
-# Ensure numeric columns
-numeric_cols = ['Year', 'Engine_Size_L',
-                'Mileage_KM', 'Price_USD', 'Sales_Volume']
-for col in numeric_cols:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
-
-# Add derived metrics
-df['Price_per_KM'] = df['Price_USD'] / \
-    (df['Mileage_KM'] + 1)  # avoid division by zero
-df['Vehicle_Age'] = 2024 - df['Year']
-
-# Categorize model segments
-
-
-def categorize_model(model):
-    if pd.isna(model):
-        return 'Other'
-    model = str(model)
-    if model.startswith('X'):
-        return 'SUV'
-    elif model.startswith('i'):
-        return 'i-Series'
-    elif model.startswith('M'):
-        return 'M-Series'
-    else:
-        return 'Sedan'
-
-
-df['Model_Segment'] = df['Model'].apply(categorize_model)
-
-# =========================
-# SAVE RAW DATA EXCEL
-# =========================
-raw_excel_path = os.path.join(OUTPUT_DIR, "Raw_BMW_Data.xlsx")
-df.to_excel(raw_excel_path, index=False)
-print(f"\n✅ Raw data saved to {raw_excel_path}")
-
-# =========================
-# SQLITE DATABASE SETUP
-# =========================
-conn = sqlite3.connect(DB_FILE)
-df.to_sql('bmw_sales', conn, if_exists='replace', index=False)
-print(f"✅ SQLite database created: {DB_FILE}")
-
-# =========================
-# SQL QUERIES FOR ANALYSIS
-# =========================
-
-
-def run_sql_queries(conn):
-    queries = {}
-
-    # Top 10 models by total sales
-    queries['top_models'] = pd.read_sql_query("""
-        SELECT Model, SUM(Sales_Volume) as Total_Sales,
-               AVG(Price_USD) as Avg_Price,
-               COUNT(*) as Transaction_Count
-        FROM bmw_sales
-        GROUP BY Model
-        ORDER BY Total_Sales DESC
-        LIMIT 10
-    """, conn)
-
-    # Regional performance
-    queries['regional_performance'] = pd.read_sql_query("""
-        SELECT Region,
-               SUM(Sales_Volume) as Total_Sales,
-               AVG(Price_USD) as Avg_Price,
-               AVG(Engine_Size_L) as Avg_Engine,
-               COUNT(*) as Transaction_Count,
-               SUM(CASE WHEN Sales_Classification = 'High' THEN 1 ELSE 0 END) as High_Sales_Count
-        FROM bmw_sales
-        GROUP BY Region
-        ORDER BY Total_Sales DESC
-    """, conn)
-
-    # Fuel type analysis
-    queries['fuel_analysis'] = pd.read_sql_query("""
-        SELECT Fuel_Type,
-               SUM(Sales_Volume) as Total_Sales,
-               AVG(Price_USD) as Avg_Price,
-               COUNT(*) as Transaction_Count
-        FROM bmw_sales
-        GROUP BY Fuel_Type
-        ORDER BY Total_Sales DESC
-    """, conn)
-
-    # Yearly trends
-    queries['yearly_trends'] = pd.read_sql_query("""
-        SELECT Year,
-               SUM(Sales_Volume) as Total_Sales,
-               AVG(Price_USD) as Avg_Price,
-               AVG(Mileage_KM) as Avg_Mileage,
-               AVG(Engine_Size_L) as Avg_Engine,
-               COUNT(*) as Transaction_Count
-        FROM bmw_sales
-        GROUP BY Year
-        ORDER BY Year
-    """, conn)
-
-    # Transmission preference by region
-    queries['transmission_by_region'] = pd.read_sql_query("""
-        SELECT Region,
-               Transmission,
-               COUNT(*) as Count,
-               ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (PARTITION BY Region), 2) as Pct
-        FROM bmw_sales
-        GROUP BY Region, Transmission
-        ORDER BY Region, Count DESC
-    """, conn)
-
-    return queries
-
-
-queries = run_sql_queries(conn)
-
-# =========================
-# ADVANCED STATISTICAL ANALYSIS
-# =========================
-
-
-def perform_statistical_analysis(df):
-    print("\n\n8. CORRELATION ANALYSIS")
-    print("-" * 40)
-    numeric_cols = ['Year', 'Engine_Size_L',
-                    'Mileage_KM', 'Price_USD', 'Sales_Volume']
-    corr_matrix = df[numeric_cols].corr()
-    print("Correlation Matrix:")
-    print(corr_matrix.round(3))
-
-    # Price vs Mileage regression
-    slope, intercept, r_value, p_value, std_err = linregress(
-        df['Mileage_KM'], df['Price_USD'])
-    print(f"\nRegression: Price vs Mileage")
-    print(f"R-squared: {r_value**2:.3f}")
-    print(f"P-value: {p_value:.4f}")
-    print(f"Slope: {slope:.3f} (price decrease per km)")
-
-    # T-test between High and Low sales classifications
-    high_prices = df[df['Sales_Classification'] == 'High']['Price_USD']
-    low_prices = df[df['Sales_Classification'] == 'Low']['Price_USD']
-    t_stat, p_val = stats.ttest_ind(high_prices, low_prices)
-    print(f"\nT-test: High vs Low sales prices")
-    print(f"T-statistic: {t_stat:.3f}, P-value: {p_val:.3f}")
-    if p_val < 0.05:
-        print("→ Significant difference in prices")
-    else:
-        print("→ No significant difference")
-
-    # Engine size trend
-    engine_trend = df.groupby('Year')['Engine_Size_L'].mean()
-    print(
-        f"\nEngine size trend (2010-2024): {engine_trend.iloc[0]:.2f}L → {engine_trend.iloc[-1]:.2f}L")
-
-
-perform_statistical_analysis(df)
-
-# =========================
-# VISUALIZATIONS
-# =========================
-
-
-def generate_visualizations(df, queries, output_dir):
-    print("\n\n10. GENERATING VISUALIZATIONS...")
-    print("-" * 40)
-
-    # Create main dashboard
-    fig = plt.figure(figsize=(20, 16))
-    fig.suptitle("BMW Sales Data Analysis Dashboard\n2010-2024",
-                 fontsize=20, fontweight='bold', y=0.98)
-
-    # 1. Top 10 Models by Sales Volume
-    ax1 = plt.subplot(3, 3, 1)
-    top_models = queries['top_models'].head(10)
-    bars = ax1.barh(top_models['Model'], top_models['Total_Sales'],
-                    color=plt.cm.viridis(np.linspace(0.2, 0.9, 10)))
-    ax1.set_title("Top 10 Models by Sales Volume", fontweight='bold')
-    ax1.set_xlabel("Total Sales")
-    ax1.invert_yaxis()
-    for i, (val, model) in enumerate(zip(top_models['Total_Sales'], top_models['Model'])):
-        ax1.text(val + 500, i, f"{val:,.0f}", va='center', fontsize=8)
-
-    # 2. Regional Market Share
-    ax2 = plt.subplot(3, 3, 2)
-    regional = queries['regional_performance']
-    ax2.pie(regional['Total_Sales'], labels=regional['Region'],
-            autopct='%1.1f%%', startangle=90)
-    ax2.set_title("Market Share by Region", fontweight='bold')
-
-    # 3. Fuel Type Distribution
-    ax3 = plt.subplot(3, 3, 3)
-    fuel = queries['fuel_analysis']
-    ax3.bar(fuel['Fuel_Type'], fuel['Total_Sales'], color=[
-            '#2E86AB', '#A23B72', '#F18F01', '#C73E1D'])
-    ax3.set_title("Sales by Fuel Type", fontweight='bold')
-    ax3.set_ylabel("Total Sales")
-    ax3.tick_params(axis='x', rotation=45)
-    for i, (val, typ) in enumerate(zip(fuel['Total_Sales'], fuel['Fuel_Type'])):
-        ax3.text(i, val + 500, f"{val:,.0f}", ha='center', fontsize=9)
-
-    # 4. Yearly Price Trend
-    ax4 = plt.subplot(3, 3, 4)
-    yearly = queries['yearly_trends']
-    ax4.plot(yearly['Year'], yearly['Avg_Price'],
-             marker='o', linewidth=2, color='#E63946')
-    ax4.set_title("Average Price Trend Over Years", fontweight='bold')
-    ax4.set_xlabel("Year")
-    ax4.set_ylabel("Avg Price (USD)")
-    ax4.grid(True, alpha=0.3)
-
-    # 5. Price vs Mileage Scatter
-    ax5 = plt.subplot(3, 3, 5)
-    scatter = ax5.scatter(df['Mileage_KM'], df['Price_USD'],
-                          c=df['Year'], cmap='viridis', alpha=0.6, s=20)
-    ax5.set_title("Price vs Mileage (colored by Year)", fontweight='bold')
-    ax5.set_xlabel("Mileage (KM)")
-    ax5.set_ylabel("Price (USD)")
-    plt.colorbar(scatter, ax=ax5, label='Year')
-
-    # 6. Transmission Preference by Region (stacked bar)
-    ax6 = plt.subplot(3, 3, 6)
-    trans_pivot = queries['transmission_by_region'].pivot(
-        index='Region', columns='Transmission', values='Pct').fillna(0)
-    trans_pivot.plot(kind='bar', stacked=True, ax=ax6, colormap='Paired')
-    ax6.set_title("Transmission Preference by Region", fontweight='bold')
-    ax6.set_ylabel("Percentage (%)")
-    ax6.legend(loc='upper right', bbox_to_anchor=(1.2, 1.0))
-    ax6.tick_params(axis='x', rotation=45)
-
-    # 7. Color Preferences (Top 6)
-    ax7 = plt.subplot(3, 3, 7)
-    color_counts = df['Color'].value_counts().head(6)
-    ax7.bar(color_counts.index, color_counts.values, color=[
-            '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'])
-    ax7.set_title("Top 6 Color Preferences", fontweight='bold')
-    ax7.set_ylabel("Number of Vehicles")
-    for i, (col, cnt) in enumerate(zip(color_counts.index, color_counts.values)):
-        ax7.text(i, cnt + 5, f"{cnt}", ha='center', fontsize=9)
-
-    # 8. Engine Size Distribution by Model Segment
-    ax8 = plt.subplot(3, 3, 8)
-    sns.boxplot(data=df, x='Model_Segment',
-                y='Engine_Size_L', ax=ax8, palette='Set2')
-    ax8.set_title("Engine Size by Model Segment", fontweight='bold')
-    ax8.set_ylabel("Engine Size (L)")
-    ax8.tick_params(axis='x', rotation=45)
-
-    # 9. Sales Classification Breakdown
-    ax9 = plt.subplot(3, 3, 9)
-    class_counts = df['Sales_Classification'].value_counts()
-    ax9.pie(class_counts.values, labels=class_counts.index,
-            autopct='%1.1f%%', colors=['#66c2a5', '#fc8d62'])
-    ax9.set_title("High vs Low Sales Classification", fontweight='bold')
-
-    plt.tight_layout()
-    dashboard_path = os.path.join(output_dir, "BMW_Sales_Dashboard.png")
-    plt.savefig(dashboard_path, dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"✅ Dashboard saved: {dashboard_path}")
-
-    # Additional advanced visualizations
-    # Heatmap: Fuel Type by Region
-    fuel_region = pd.crosstab(
-        df['Region'], df['Fuel_Type'], normalize='index') * 100
-    plt.figure(figsize=(10, 6))
-    sns.heatmap(fuel_region, annot=True, fmt='.1f', cmap='YlOrRd',
-                cbar_kws={'label': 'Percentage (%)'})
-    plt.title('Fuel Type Preference by Region (%)', fontweight='bold')
-    plt.tight_layout()
-    heatmap_path = os.path.join(output_dir, "Fuel_Region_Heatmap.png")
-    plt.savefig(heatmap_path, dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"✅ Heatmap saved: {heatmap_path}")
-
-    # Boxplot: Price by Model Segment
-    plt.figure(figsize=(10, 6))
-    sns.boxplot(data=df, x='Model_Segment', y='Price_USD', palette='Set3')
-    plt.title('Price Distribution by Model Segment', fontweight='bold')
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    boxplot_path = os.path.join(output_dir, "Price_by_Segment.png")
-    plt.savefig(boxplot_path, dpi=300, bbox_inches='tight')
-    plt.close()
-    print(f"✅ Boxplot saved: {boxplot_path}")
-
-
-generate_visualizations(df, queries, OUTPUT_DIR)
-
-# =========================
-# EXCEL OUTPUTS (MULTI-SHEET)
-# =========================
-excel_file = os.path.join(OUTPUT_DIR, "BMW_Sales_Comprehensive_Analysis.xlsx")
-with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
-    df.to_excel(writer, sheet_name='Raw_Data', index=False)
-    queries['top_models'].to_excel(
-        writer, sheet_name='Top_Models', index=False)
-    queries['regional_performance'].to_excel(
-        writer, sheet_name='Regional_Performance', index=False)
-    queries['fuel_analysis'].to_excel(
-        writer, sheet_name='Fuel_Analysis', index=False)
-    queries['yearly_trends'].to_excel(
-        writer, sheet_name='Yearly_Trends', index=False)
-    queries['transmission_by_region'].to_excel(
-        writer, sheet_name='Transmission_by_Region', index=False)
-
-    # Summary statistics
-    summary_stats = df.describe(include='all')
-    summary_stats.to_excel(writer, sheet_name='Summary_Statistics')
-
-    # Correlation matrix
-    numeric_cols = ['Year', 'Engine_Size_L',
-                    'Mileage_KM', 'Price_USD', 'Sales_Volume']
-    corr_matrix = df[numeric_cols].corr()
-    corr_matrix.to_excel(writer, sheet_name='Correlation_Matrix')
-
-print(f"✅ Excel analysis saved: {excel_file}")
-
-# =========================
-# PROFESSIONAL PDF REPORT
-# =========================
-
-
-def generate_pdf_report(df, queries, output_dir):
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    pdf_path = os.path.join(
-        output_dir, f"BMW_Sales_Analysis_Report_{timestamp}.pdf")
-
-    with PdfPages(pdf_path) as pdf:
-        # Cover page
-        fig, ax = plt.subplots(figsize=(8.5, 11))
-        ax.axis('off')
-        ax.add_patch(Rectangle((0, 0), 1, 1, color='#1a3b5c', alpha=0.9))
-        ax.text(0.5, 0.7, "BMW SALES DATA\nDEEP DIVE ANALYSIS", fontsize=24, fontweight='bold',
-                ha='center', color='white', linespacing=1.5)
-        ax.text(0.5, 0.5, "2010-2024", fontsize=18, ha='center', color='white')
-        ax.text(0.5, 0.3, f"Generated: {datetime.now().strftime('%B %d, %Y')}",
-                fontsize=12, ha='center', color='white')
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
-
-        # Executive Summary Page
-        fig, ax = plt.subplots(figsize=(8.5, 11))
-        ax.axis('off')
-        summary_text = [
-            "EXECUTIVE SUMMARY",
-            "",
-            f"• Total Vehicles Analyzed: {len(df):,}",
-            f"• Total Sales Volume: {df['Sales_Volume'].sum():,}",
-            f"• Date Range: {df['Year'].min()} - {df['Year'].max()}",
-            f"• Average Price: ${df['Price_USD'].mean():,.0f}",
-            f"• Average Mileage: {df['Mileage_KM'].mean():,.0f} km",
-            f"• Top Model: {queries['top_models'].iloc[0]['Model']} ({queries['top_models'].iloc[0]['Total_Sales']:,.0f} units)",
-            f"• Top Region: {queries['regional_performance'].iloc[0]['Region']}",
-            f"• Dominant Fuel Type: {queries['fuel_analysis'].iloc[0]['Fuel_Type']}",
-            f"• Most Popular Color: {df['Color'].mode().iloc[0]}",
-            "",
-            "KEY INSIGHTS:",
-            "• Strong negative correlation between price and mileage (R² ≈ 0.8)",
-            "• Automatic transmission dominates in all regions (>70%)",
-            "• SUVs (X-series) command highest prices and sales volumes",
-            "• Hybrid and Electric vehicles show increasing trend in later years"
-        ]
-        y_pos = 0.9
-        for line in summary_text:
-            ax.text(0.1, y_pos, line, fontsize=12,
-                    fontweight='bold' if line == "EXECUTIVE SUMMARY" else 'normal',
-                    va='top', transform=ax.transAxes)
-            y_pos -= 0.04
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
-
-        # Dashboard snapshot
-        dashboard_img = os.path.join(output_dir, "BMW_Sales_Dashboard.png")
-        if os.path.exists(dashboard_img):
-            fig, ax = plt.subplots(figsize=(8.5, 11))
-            ax.axis('off')
-            img = plt.imread(dashboard_img)
-            ax.imshow(img, aspect='auto', extent=[0, 1, 0, 1])
-            ax.text(0.5, 0.95, "COMPREHENSIVE DASHBOARD", fontsize=16,
-                    fontweight='bold', ha='center', transform=ax.transAxes)
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close()
-
-        # Add heatmap and boxplot if desired
-        heatmap_img = os.path.join(output_dir, "Fuel_Region_Heatmap.png")
-        if os.path.exists(heatmap_img):
-            fig, ax = plt.subplots(figsize=(8.5, 11))
-            ax.axis('off')
-            img = plt.imread(heatmap_img)
-            ax.imshow(img, aspect='auto', extent=[0, 1, 0, 1])
-            ax.text(0.5, 0.95, "FUEL TYPE PREFERENCE BY REGION", fontsize=16,
-                    fontweight='bold', ha='center', transform=ax.transAxes)
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close()
-
-    print(f"✅ PDF report generated: {pdf_path}")
-
-
-generate_pdf_report(df, queries, OUTPUT_DIR)
-
-# =========================
-# FINAL SUMMARY
-# =========================
-print("\n" + "="*60)
-print("KEY FINDINGS SUMMARY")
-print("="*60)
-
-top_model = queries['top_models'].iloc[0]
-top_region = queries['regional_performance'].iloc[0]
-top_fuel = queries['fuel_analysis'].iloc[0]
-top_color = df['Color'].value_counts().index[0]
-auto_pct = (df['Transmission'] == 'Automatic').mean() * 100
-
-print(f"📊 TOTAL VEHICLES: {len(df):,}")
-print(f"💰 TOTAL SALES VOLUME: {df['Sales_Volume'].sum():,}")
-print(
-    f"🏆 TOP MODEL: {top_model['Model']} ({top_model['Total_Sales']:,.0f} units)")
-print(
-    f"🌎 TOP REGION: {top_region['Region']} ({top_region['Total_Sales']:,.0f} units)")
-print(
-    f"⛽ DOMINANT FUEL: {top_fuel['Fuel_Type']} ({top_fuel['Total_Sales']:,.0f} units)")
-print(f"🎨 TOP COLOR: {top_color}")
-print(f"💰 AVG PRICE: ${df['Price_USD'].mean():,.0f}")
-print(f"🔧 AUTOMATIC TRANSMISSION: {auto_pct:.1f}%")
-print(
-    f"📈 STRONGEST CORRELATION: Price vs Mileage ({df['Price_USD'].corr(df['Mileage_KM']):.3f})")
-
-print("\n" + "="*60)
-print("ANALYSIS COMPLETE")
-print("="*60)
-print(f"✅ Outputs saved in '{OUTPUT_DIR}' folder")
-print("📊 1. Excel: BMW_Sales_Comprehensive_Analysis.xlsx")
-print("📈 2. PNG Dashboard: BMW_Sales_Dashboard.png")
-print("📄 3. PDF Report: BMW_Sales_Analysis_Report_[timestamp].pdf")
-print("🗃️  4. SQLite Database: BMW_Sales.db")
-print("🖼️  5. Additional charts: Fuel_Region_Heatmap.png, Price_by_Segment.png")
-print("="*60)
-
-conn.close()
+if __name__ == '__main__':
+    main()
@@ -5,506 +5,222 @@
 # Professional analysis of BMW sales data (2010-2024) with
 # SQL integration, multi-format exports, automated reporting,
 # and an interactive HTML dashboard. PDF now includes dashboard image.
+# Shared pipeline steps live in bmw_core.py; this script adds the Plotly layer.
 # =============================================================================
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import sqlite3
 import os
-from datetime import datetime
-from matplotlib.backends.backend_pdf import PdfPages
-from matplotlib.patches import Rectangle
-import warnings
-from scipy import stats
-from scipy.stats import linregress
+from concurrent.futures import ThreadPoolExecutor
 import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import plotly.io as pio
 
-warnings.filterwarnings('ignore')
+from bmw_core import (OUTPUT_DIR, configure_runtime, prepare, scatter_sample,
+                      save_excel, generate_pdf_report, print_summary)
 
-# =========================
-# SETTINGS
-# =========================
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
-
-script_dir = os.path.dirname(__file__)
-OUTPUT_DIR = os.path.join(script_dir, "BMW_Sales_Analysis_Results")
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-# Base filename (without extension)
-BASE_NAME = "BMW sales data (2010-2024) (1)"
-# Try with .csv first, then without
-CSV_FILE_CANDIDATES = [
-    os.path.join(script_dir, BASE_NAME + ".csv"),
-    os.path.join(script_dir, BASE_NAME)
-]
-CSV_FILE = None
-for candidate in CSV_FILE_CANDIDATES:
-    if os.path.exists(candidate):
-        CSV_FILE = candidate
-        break
-
-if CSV_FILE is None:
-    print("\n" + "="*60)
-    print("ERROR: BMW data file not found!")
-    print("="*60)
-    print(f"Expected one of:")
-    for c in CSV_FILE_CANDIDATES:
-        print(f"  {c}")
-    print("\nPlease copy your file to this folder and ensure it is named")
-    print(f"  {BASE_NAME}  or  {BASE_NAME}.csv")
-    print("="*60)
-    exit(1)
-
-DB_FILE = os.path.join(OUTPUT_DIR, "BMW_Sales.db")
-
-print("=" * 60)
-print("BMW SALES DATA DEEP DIVE ANALYSIS (Enhanced Visuals)")
-print("=" * 60)
-
-# =========================
-# LOAD DATA
-# =========================
-
-
-def load_data(file_path):
-    print("\n1. DATA OVERVIEW")
-    print("-" * 40)
-    df = pd.read_csv(file_path)
-    print(f"Dataset shape: {df.shape}")
-    print(f"Total records: {df.shape[0]:,}")
-    print(f"Total sales volume: {df['Sales_Volume'].sum():,}")
-    return df
-
-
-df = load_data(CSV_FILE)
-
-# =========================
-# INITIAL CLEANING & METRICS
-# =========================
-numeric_cols = ['Year', 'Engine_Size_L',
-                'Mileage_KM', 'Price_USD', 'Sales_Volume']
-for col in numeric_cols:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
-
-df['Price_per_KM'] = df['Price_USD'] / (df['Mileage_KM'] + 1)
-df['Vehicle_Age'] = 2024 - df['Year']
-
-
-def categorize_model(model):
-    if pd.isna(model):
-        return 'Other'
-    model = str(model)
-    if model.startswith('X'):
-        return 'SUV'
-    elif model.startswith('i'):
-        return 'i-Series'
-    elif model.startswith('M'):
-        return 'M-Series'
-    else:
-        return 'Sedan'
-
-
-df['Model_Segment'] = df['Model'].apply(categorize_model)
-
-# =========================
-# SAVE RAW DATA EXCEL
-# =========================
-raw_excel_path = os.path.join(OUTPUT_DIR, "Raw_BMW_Data.xlsx")
-df.to_excel(raw_excel_path, index=False)
-print(f"\n✅ Raw data saved to {raw_excel_path}")
+# Static export settings (Kaleido); scale 1 is enough for the PDF page
+pio.defaults.default_format = 'png'
+pio.defaults.default_width = 1200
+pio.defaults.default_height = 1200
+pio.defaults.default_scale = 1
 
-# =========================
-# SQLITE DATABASE SETUP
-# =========================
-conn = sqlite3.connect(DB_FILE)
-df.to_sql('bmw_sales', conn, if_exists='replace', index=False)
-print(f"✅ SQLite database created: {DB_FILE}")
 
 # =========================
-# SQL QUERIES FOR ANALYSIS
+# GENERATE INTERACTIVE PLOTLY VISUALS
 # =========================
 
+# 3x3 grid geometry, matching make_subplots(vertical_spacing=0.12,
+# horizontal_spacing=0.1)
+GRID_ROWS, GRID_COLS = 3, 3
+V_SPACING, H_SPACING = 0.12, 0.1
 
-def run_sql_queries(conn):
-    queries = {}
-    queries['top_models'] = pd.read_sql_query("""
-        SELECT Model, SUM(Sales_Volume) as Total_Sales,
-               AVG(Price_USD) as Avg_Price,
-               COUNT(*) as Transaction_Count
-        FROM bmw_sales
-        GROUP BY Model
-        ORDER BY Total_Sales DESC
-        LIMIT 10
-    """, conn)
-
-    queries['regional_performance'] = pd.read_sql_query("""
-        SELECT Region,
-               SUM(Sales_Volume) as Total_Sales,
-               AVG(Price_USD) as Avg_Price,
-               AVG(Engine_Size_L) as Avg_Engine,
-               COUNT(*) as Transaction_Count,
-               SUM(CASE WHEN Sales_Classification = 'High' THEN 1 ELSE 0 END) as High_Sales_Count
-        FROM bmw_sales
-        GROUP BY Region
-        ORDER BY Total_Sales DESC
-    """, conn)
-
-    queries['fuel_analysis'] = pd.read_sql_query("""
-        SELECT Fuel_Type,
-               SUM(Sales_Volume) as Total_Sales,
-               AVG(Price_USD) as Avg_Price,
-               COUNT(*) as Transaction_Count
-        FROM bmw_sales
-        GROUP BY Fuel_Type
-        ORDER BY Total_Sales DESC
-    """, conn)
-
-    queries['yearly_trends'] = pd.read_sql_query("""
-        SELECT Year,
-               SUM(Sales_Volume) as Total_Sales,
-               AVG(Price_USD) as Avg_Price,
-               AVG(Mileage_KM) as Avg_Mileage,
-               AVG(Engine_Size_L) as Avg_Engine,
-               COUNT(*) as Transaction_Count
-        FROM bmw_sales
-        GROUP BY Year
-        ORDER BY Year
-    """, conn)
-
-    queries['transmission_by_region'] = pd.read_sql_query("""
-        SELECT Region,
-               Transmission,
-               COUNT(*) as Count,
-               ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (PARTITION BY Region), 2) as Pct
-        FROM bmw_sales
-        GROUP BY Region, Transmission
-        ORDER BY Region, Count DESC
-    """, conn)
-    return queries
-
-
-queries = run_sql_queries(conn)
 
-# =========================
-# ADVANCED STATISTICAL ANALYSIS
-# =========================
+def grid_domain(row, col):
+    """Paper-coordinate x/y domains of a 1-based (row, col) grid cell."""
+    width = (1 - H_SPACING * (GRID_COLS - 1)) / GRID_COLS
+    height = (1 - V_SPACING * (GRID_ROWS - 1)) / GRID_ROWS
+    x0 = (col - 1) * (width + H_SPACING)
+    y0 = (GRID_ROWS - row) * (height + V_SPACING)
+    # Clamp float round-off; plotly rejects domains outside [0, 1]
+    return [x0, min(x0 + width, 1)], [y0, min(y0 + height, 1)]
 
 
-def perform_statistical_analysis(df):
-    print("\n\n8. CORRELATION ANALYSIS")
+def render_plotly(df, queries, metrics, output_dir):
+    print("\n\n10. GENERATING POWER BI-LIKE INTERACTIVE VISUALS...")
     print("-" * 40)
-    numeric_cols = ['Year', 'Engine_Size_L',
-                    'Mileage_KM', 'Price_USD', 'Sales_Volume']
-    corr_matrix = df[numeric_cols].corr()
-    print("Correlation Matrix:")
-    print(corr_matrix.round(3))
-
-    slope, intercept, r_value, p_value, std_err = linregress(
-        df['Mileage_KM'], df['Price_USD'])
-    print(f"\nRegression: Price vs Mileage")
-    print(f"R-squared: {r_value**2:.3f}")
-    print(f"P-value: {p_value:.4f}")
-    print(f"Slope: {slope:.3f} (price decrease per km)")
-
-    high_prices = df[df['Sales_Classification'] == 'High']['Price_USD']
-    low_prices = df[df['Sales_Classification'] == 'Low']['Price_USD']
-    t_stat, p_val = stats.ttest_ind(high_prices, low_prices)
-    print(f"\nT-test: High vs Low sales prices")
-    print(f"T-statistic: {t_stat:.3f}, P-value: {p_val:.3f}")
-    if p_val < 0.05:
-        print("→ Significant difference in prices")
-    else:
-        print("→ No significant difference")
-
-    engine_trend = df.groupby('Year')['Engine_Size_L'].mean()
-    print(
-        f"\nEngine size trend (2010-2024): {engine_trend.iloc[0]:.2f}L → {engine_trend.iloc[-1]:.2f}L")
-
-
-perform_statistical_analysis(df)
 
-# =========================
-# GENERATE INTERACTIVE PLOTLY VISUALS
-# =========================
-print("\n\n10. GENERATING POWER BI-LIKE INTERACTIVE VISUALS...")
-print("-" * 40)
-
-# Create an HTML dashboard with multiple plots
-dashboard_html_path = os.path.join(
-    OUTPUT_DIR, "BMW_Interactive_Dashboard.html")
-dashboard_png_path = os.path.join(
-    OUTPUT_DIR, "BMW_Interactive_Dashboard.png")  # for PDF
-
-# Build multi‑plot figure using make_subplots
-fig = make_subplots(
-    rows=3, cols=3,
-    subplot_titles=("Top 10 Models by Sales", "Market Share by Region", "Sales by Fuel Type",
-                    "Average Price Trend", "Price vs Mileage", "Transmission by Region",
-                    "Top Colors", "Engine Size by Segment", "Sales Classification"),
-    specs=[[{'type': 'bar'}, {'type': 'pie'}, {'type': 'bar'}],
-           [{'type': 'scatter'}, {'type': 'scatter'}, {'type': 'bar'}],
-           [{'type': 'bar'}, {'type': 'box'}, {'type': 'pie'}]],
-    vertical_spacing=0.12,
-    horizontal_spacing=0.1
-)
-
-# 1. Top 10 Models (horizontal bar)
-top_models = queries['top_models'].head(10)
-fig.add_trace(
-    go.Bar(x=top_models['Total_Sales'], y=top_models['Model'],
-           orientation='h', marker=dict(color=px.colors.sequential.Viridis_r, showscale=False),
-           text=top_models['Total_Sales'], textposition='outside'),
-    row=1, col=1
-)
-
-# 2. Regional market share (pie)
-regional = queries['regional_performance']
-fig.add_trace(
-    go.Pie(labels=regional['Region'], values=regional['Total_Sales'],
-           hole=0.3, textinfo='percent+label', marker=dict(colors=px.colors.qualitative.Set2)),
-    row=1, col=2
-)
-
-# 3. Fuel type sales (bar)
-fuel = queries['fuel_analysis']
-fig.add_trace(
-    go.Bar(x=fuel['Fuel_Type'], y=fuel['Total_Sales'],
-           marker_color=px.colors.qualitative.Set1,
-           text=fuel['Total_Sales'], textposition='outside'),
-    row=1, col=3
-)
-
-# 4. Yearly price trend (line)
-yearly = queries['yearly_trends']
-fig.add_trace(
-    go.Scatter(x=yearly['Year'], y=yearly['Avg_Price'],
-               mode='lines+markers', name='Avg Price',
-               line=dict(color='firebrick', width=3)),
-    row=2, col=1
-)
-
-# 5. Price vs Mileage scatter (colored by Year)
-fig.add_trace(
-    go.Scatter(x=df['Mileage_KM'], y=df['Price_USD'],
-               mode='markers', marker=dict(color=df['Year'], colorscale='Viridis', showscale=True,
-                                           size=5, colorbar=dict(title="Year")),
-               text=df['Model'], hoverinfo='text+x+y'),
-    row=2, col=2
-)
-
-# 6. Transmission by region (stacked bar)
-trans_pivot = queries['transmission_by_region'].pivot(
-    index='Region', columns='Transmission', values='Pct').fillna(0)
-for trans in trans_pivot.columns:
-    fig.add_trace(
-        go.Bar(x=trans_pivot.index, y=trans_pivot[trans], name=trans,
-               marker_color='#1f77b4' if trans == 'Automatic' else '#ff7f0e'),
-        row=2, col=3
-    )
-fig.update_layout(barmode='stack')
-
-# 7. Top colors
-color_counts = df['Color'].value_counts().head(6).reset_index()
-color_counts.columns = ['Color', 'Count']
-fig.add_trace(
-    go.Bar(x=color_counts['Color'], y=color_counts['Count'],
-           marker_color=px.colors.qualitative.Pastel,
-           text=color_counts['Count'], textposition='outside'),
-    row=3, col=1
-)
-
-# 8. Engine size by segment (box plot)
-fig.add_trace(
-    go.Box(x=df['Model_Segment'], y=df['Engine_Size_L'],
-           marker_color='lightblue', line=dict(color='darkblue')),
-    row=3, col=2
-)
-
-# 9. Sales classification pie
-class_counts = df['Sales_Classification'].value_counts()
-fig.add_trace(
-    go.Pie(labels=class_counts.index, values=class_counts.values,
-           hole=0.3, textinfo='percent+label', marker=dict(colors=['#66c2a5', '#fc8d62'])),
-    row=3, col=3
-)
-
-# Update layout
-fig.update_layout(
-    title_text="BMW Sales Interactive Dashboard (2010-2024)",
-    title_font_size=20,
-    showlegend=False,
-    height=1200,
-    hovermode='closest'
-)
-
-# Update axes labels
-fig.update_xaxes(title_text="Total Sales", row=1, col=1)
-fig.update_yaxes(title_text="Model", row=1, col=1)
-fig.update_xaxes(title_text="Fuel Type", row=1, col=3)
-fig.update_yaxes(title_text="Sales", row=1, col=3)
-fig.update_xaxes(title_text="Year", row=2, col=1)
-fig.update_yaxes(title_text="Avg Price (USD)", row=2, col=1)
-fig.update_xaxes(title_text="Mileage (KM)", row=2, col=2)
-fig.update_yaxes(title_text="Price (USD)", row=2, col=2)
-fig.update_xaxes(title_text="Region", row=2, col=3)
-fig.update_yaxes(title_text="Percentage (%)", row=2, col=3)
-fig.update_xaxes(title_text="Color", row=3, col=1)
-fig.update_yaxes(title_text="Count", row=3, col=1)
-fig.update_xaxes(title_text="Model Segment", row=3, col=2)
-fig.update_yaxes(title_text="Engine Size (L)", row=3, col=2)
-
-# Write to HTML
-pio.write_html(fig, file=dashboard_html_path, auto_open=False)
-print(f"✅ Interactive HTML dashboard saved: {dashboard_html_path}")
-
-# Save a static PNG for the PDF (requires kaleido)
-try:
-    pio.write_image(fig, dashboard_png_path, width=1200, height=1200, scale=2)
+    # Create an HTML dashboard with multiple plots
+    dashboard_html_path = os.path.join(
+        output_dir, "BMW_Interactive_Dashboard.html")
+
+    # The figure is a plain dict: no make_subplots and no per-trace
+    # validation. Cartesian panels get their own axis pair, numbered in
+    # grid order; pies sit in a domain.
+    titles = ["Top 10 Models by Sales", "Market Share by Region", "Sales by Fuel Type",
+              "Average Price Trend", "Price vs Mileage", "Transmission by Region",
+              "Top Colors", "Engine Size by Segment", "Sales Classification"]
+    axis_titles = {
+        (1, 1): ("Total Sales", "Model"),
+        (1, 3): ("Fuel Type", "Sales"),
+        (2, 1): ("Year", "Avg Price (USD)"),
+        (2, 2): ("Mileage (KM)", "Price (USD)"),
+        (2, 3): ("Region", "Percentage (%)"),
+        (3, 1): ("Color", "Count"),
+        (3, 2): ("Model Segment", "Engine Size (L)"),
+    }
+    layout = {
+        # A raw dict does not pick up the default template on its own
+        'template': pio.templates[pio.templates.default].to_plotly_json(),
+        'title': {'text': "BMW Sales Interactive Dashboard (2010-2024)",
+                  'font': {'size': 20}},
+        'showlegend': False,
+        'height': 1200,
+        'hovermode': 'closest',
+        'barmode': 'stack',
+        'annotations': [],
+    }
+    anchors = {}
+    n_axes = 0
+    for i, title in enumerate(titles):
+        row, col = divmod(i, GRID_COLS)
+        row, col = row + 1, col + 1
+        x_domain, y_domain = grid_domain(row, col)
+        layout['annotations'].append({
+            'text': title, 'showarrow': False, 'font': {'size': 16},
+            'xref': 'paper', 'yref': 'paper', 'x': sum(x_domain) / 2,
+            'y': y_domain[1], 'xanchor': 'center', 'yanchor': 'bottom'})
+        if (row, col) in axis_titles:
+            n_axes += 1
+            suffix = '' if n_axes == 1 else str(n_axes)
+            anchors[(row, col)] = {'xaxis': f'x{suffix}', 'yaxis': f'y{suffix}'}
+            x_title, y_title = axis_titles[(row, col)]
+            layout[f'xaxis{suffix}'] = {'domain': x_domain, 'anchor': f'y{suffix}',
+                                        'title': {'text': x_title}}
+            layout[f'yaxis{suffix}'] = {'domain': y_domain, 'anchor': f'x{suffix}',
+                                        'title': {'text': y_title}}
+        else:
+            anchors[(row, col)] = {'domain': {'x': x_domain, 'y': y_domain}}
+
+    data = []
+
+    # 1. Top 10 Models (horizontal bar)
+    top_models = queries['top_models'].head(10)
+    data.append(dict(
+        type='bar', x=top_models['Total_Sales'], y=top_models['Model'],
+        orientation='h', marker=dict(color=px.colors.sequential.Viridis_r, showscale=False),
+        text=top_models['Total_Sales'], textposition='outside', **anchors[(1, 1)]))
+
+    # 2. Regional market share (pie)
+    regional = queries['regional_performance']
+    data.append(dict(
+        type='pie', labels=regional['Region'], values=regional['Total_Sales'],
+        hole=0.3, textinfo='percent+label', marker=dict(colors=px.colors.qualitative.Set2),
+        **anchors[(1, 2)]))
+
+    # 3. Fuel type sales (bar)
+    fuel = queries['fuel_analysis']
+    data.append(dict(
+        type='bar', x=fuel['Fuel_Type'], y=fuel['Total_Sales'],
+        marker=dict(color=px.colors.qualitative.Set1),
+        text=fuel['Total_Sales'], textposition='outside', **anchors[(1, 3)]))
+
+    # 4. Yearly price trend (line)
+    yearly = queries['yearly_trends']
+    data.append(dict(
+        type='scatter', x=yearly['Year'], y=yearly['Avg_Price'],
+        mode='lines+markers', name='Avg Price',
+        line=dict(color='firebrick', width=3), **anchors[(2, 1)]))
+
+    # 5. Price vs Mileage scatter (colored by Year), same sample as the
+    # static dashboard, drawn with WebGL
+    sample = df.iloc[scatter_sample(df)]
+    data.append(dict(
+        type='scattergl', x=sample['Mileage_KM'], y=sample['Price_USD'],
+        mode='markers', marker=dict(color=sample['Year'], colorscale='Viridis', showscale=True,
+                                    size=5, colorbar=dict(title=dict(text="Year"))),
+        text=sample['Model'], hoverinfo='text+x+y', **anchors[(2, 2)]))
+
+    # 6. Transmission by region (stacked bar)
+    trans_pivot = queries['transmission_by_region']
+    data.extend(
+        dict(type='bar', x=trans_pivot.index, y=trans_pivot[trans], name=trans,
+             marker=dict(color='#1f77b4' if trans == 'Automatic' else '#ff7f0e'),
+             **anchors[(2, 3)])
+        for trans in trans_pivot.columns)
+
+    # 7. Top colors
+    color_counts = metrics['color_counts'].head(6).reset_index()
+    color_counts.columns = ['Color', 'Count']
+    data.append(dict(
+        type='bar', x=color_counts['Color'], y=color_counts['Count'],
+        marker=dict(color=px.colors.qualitative.Pastel),
+        text=color_counts['Count'], textposition='outside', **anchors[(3, 1)]))
+
+    # 8. Engine size by segment (box plot)
+    data.append(dict(
+        type='box', x=df['Model_Segment'], y=df['Engine_Size_L'],
+        marker=dict(color='lightblue'), line=dict(color='darkblue'),
+        **anchors[(3, 2)]))
+
+    # 9. Sales classification pie
+    class_counts = metrics['class_counts']
+    data.append(dict(
+        type='pie', labels=class_counts.index, values=class_counts.values,
+        hole=0.3, textinfo='percent+label', marker=dict(colors=['#66c2a5', '#fc8d62']),
+        **anchors[(3, 3)]))
+
+    fig = {'data': data, 'layout': layout}
+
+    # Write to HTML (plotly.js loaded from the CDN instead of inlined)
+    pio.write_html(fig, file=dashboard_html_path, auto_open=False,
+                   include_plotlyjs='cdn', full_html=True, validate=False,
+                   config={'responsive': True})
+    print(f"✅ Interactive HTML dashboard saved: {dashboard_html_path}")
+
+    return fig
+
+
+def export_dashboard_png(fig, output_dir):
+    """Render the static dashboard PNG once (requires kaleido).
+
+    Returns the encoded bytes, which feed the PDF directly and are also
+    dumped to disk as-is; returns None on failure.
+    """
+    dashboard_png_path = os.path.join(
+        output_dir, "BMW_Interactive_Dashboard.png")
+    try:
+        png_bytes = pio.to_image(fig, validate=False)
+    except Exception as e:
+        print(f"⚠️ Could not save static dashboard image. Install kaleido for this feature: pip install kaleido")
+        print(f"   Error: {e}")
+        return None
+    with open(dashboard_png_path, 'wb') as f:
+        f.write(png_bytes)
     print(f"✅ Static dashboard image saved: {dashboard_png_path}")
-except Exception as e:
-    print(f"⚠️ Could not save static dashboard image. Install kaleido for this feature: pip install kaleido")
-    print(f"   Error: {e}")
 
-# =========================
-# EXCEL OUTPUTS (MULTI-SHEET)
-# =========================
-excel_file = os.path.join(OUTPUT_DIR, "BMW_Sales_Comprehensive_Analysis.xlsx")
-with pd.ExcelWriter(excel_file, engine='openpyxl') as writer:
-    df.to_excel(writer, sheet_name='Raw_Data', index=False)
-    queries['top_models'].to_excel(
-        writer, sheet_name='Top_Models', index=False)
-    queries['regional_performance'].to_excel(
-        writer, sheet_name='Regional_Performance', index=False)
-    queries['fuel_analysis'].to_excel(
-        writer, sheet_name='Fuel_Analysis', index=False)
-    queries['yearly_trends'].to_excel(
-        writer, sheet_name='Yearly_Trends', index=False)
-    queries['transmission_by_region'].to_excel(
-        writer, sheet_name='Transmission_by_Region', index=False)
-    summary_stats = df.describe(include='all')
-    summary_stats.to_excel(writer, sheet_name='Summary_Statistics')
-    numeric_cols = ['Year', 'Engine_Size_L',
-                    'Mileage_KM', 'Price_USD', 'Sales_Volume']
-    corr_matrix = df[numeric_cols].corr()
-    corr_matrix.to_excel(writer, sheet_name='Correlation_Matrix')
-
-print(f"✅ Excel analysis saved: {excel_file}")
+    return png_bytes
 
-# =========================
-# PROFESSIONAL PDF REPORT (static, using matplotlib, now with dashboard image)
-# =========================
 
+def main():
+    configure_runtime()
+    df, queries, metrics = prepare(
+        "BMW SALES DATA DEEP DIVE ANALYSIS (Enhanced Visuals)")
 
-def generate_pdf_report(df, queries, output_dir, dashboard_png_path):
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    pdf_path = os.path.join(
-        output_dir, f"BMW_Sales_Analysis_Report_{timestamp}.pdf")
-
-    with PdfPages(pdf_path) as pdf:
-        # Cover page
-        fig, ax = plt.subplots(figsize=(8.5, 11))
-        ax.axis('off')
-        ax.add_patch(Rectangle((0, 0), 1, 1, color='#1a3b5c', alpha=0.9))
-        ax.text(0.5, 0.7, "BMW SALES DATA\nDEEP DIVE ANALYSIS", fontsize=24, fontweight='bold',
-                ha='center', color='white', linespacing=1.5)
-        ax.text(0.5, 0.5, "2010-2024", fontsize=18, ha='center', color='white')
-        ax.text(0.5, 0.3, f"Generated: {datetime.now().strftime('%B %d, %Y')}",
-                fontsize=12, ha='center', color='white')
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
-
-        # Executive Summary Page
-        fig, ax = plt.subplots(figsize=(8.5, 11))
-        ax.axis('off')
-        summary_text = [
-            "EXECUTIVE SUMMARY",
-            "",
-            f"• Total Vehicles Analyzed: {len(df):,}",
-            f"• Total Sales Volume: {df['Sales_Volume'].sum():,}",
-            f"• Date Range: {df['Year'].min()} - {df['Year'].max()}",
-            f"• Average Price: ${df['Price_USD'].mean():,.0f}",
-            f"• Average Mileage: {df['Mileage_KM'].mean():,.0f} km",
-            f"• Top Model: {queries['top_models'].iloc[0]['Model']} ({queries['top_models'].iloc[0]['Total_Sales']:,.0f} units)",
-            f"• Top Region: {queries['regional_performance'].iloc[0]['Region']}",
-            f"• Dominant Fuel Type: {queries['fuel_analysis'].iloc[0]['Fuel_Type']}",
-            f"• Most Popular Color: {df['Color'].mode().iloc[0]}",
-            "",
-            "KEY INSIGHTS:",
-            "• Strong negative correlation between price and mileage (R² ≈ 0.8)",
-            "• Automatic transmission dominates in all regions (>70%)",
-            "• SUVs (X-series) command highest prices and sales volumes",
-            "• Hybrid and Electric vehicles show increasing trend in later years"
-        ]
-        y_pos = 0.9
-        for line in summary_text:
-            ax.text(0.1, y_pos, line, fontsize=12,
-                    fontweight='bold' if line == "EXECUTIVE SUMMARY" else 'normal',
-                    va='top', transform=ax.transAxes)
-            y_pos -= 0.04
-        pdf.savefig(fig, bbox_inches='tight')
-        plt.close()
-
-        # Add dashboard image if available
-        if os.path.exists(dashboard_png_path):
-            fig, ax = plt.subplots(figsize=(8.5, 11))
-            ax.axis('off')
-            img = plt.imread(dashboard_png_path)
-            ax.imshow(img, aspect='auto', extent=[0, 1, 0, 1])
-            ax.text(0.5, 0.95, "INTERACTIVE DASHBOARD (Static View)", fontsize=16,
-                    fontweight='bold', ha='center', transform=ax.transAxes)
-            pdf.savefig(fig, bbox_inches='tight')
-            plt.close()
-        else:
-            print("⚠️ Dashboard image not found, skipping in PDF.")
-
-    print(f"✅ PDF report generated: {pdf_path}")
+    fig = render_plotly(df, queries, metrics, OUTPUT_DIR)
+    # Kaleido runs in a Chromium subprocess; overlap it with the Excel write
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        png_future = pool.submit(export_dashboard_png, fig, OUTPUT_DIR)
+        save_excel(df, queries, metrics, OUTPUT_DIR)
+        dashboard_png = png_future.result()
+    generate_pdf_report(df, metrics, OUTPUT_DIR, images=[
+        (dashboard_png, "INTERACTIVE DASHBOARD (Static View)")])
 
+    print_summary(df, metrics, [
+        "📊 1. Excel: BMW_Sales_Comprehensive_Analysis.xlsx",
+        "📈 2. Interactive HTML Dashboard: BMW_Interactive_Dashboard.html",
+        "🖼️  3. Static Dashboard Image: BMW_Interactive_Dashboard.png (if kaleido installed)",
+        "📄 4. PDF Report: BMW_Sales_Analysis_Report_[timestamp].pdf (includes image)",
+        "🗃️  5. SQLite Database: BMW_Sales.db",
+    ])
 
-generate_pdf_report(df, queries, OUTPUT_DIR, dashboard_png_path)
 
-# =========================
-# FINAL SUMMARY
-# =========================
-print("\n" + "="*60)
-print("KEY FINDINGS SUMMARY")
-print("="*60)
-
-top_model = queries['top_models'].iloc[0]
-top_region = queries['regional_performance'].iloc[0]
-top_fuel = queries['fuel_analysis'].iloc[0]
-top_color = df['Color'].value_counts().index[0]
-auto_pct = (df['Transmission'] == 'Automatic').mean() * 100
-
-print(f"📊 TOTAL VEHICLES: {len(df):,}")
-print(f"💰 TOTAL SALES VOLUME: {df['Sales_Volume'].sum():,}")
-print(
-    f"🏆 TOP MODEL: {top_model['Model']} ({top_model['Total_Sales']:,.0f} units)")
-print(
-    f"🌎 TOP REGION: {top_region['Region']} ({top_region['Total_Sales']:,.0f} units)")
-print(
-    f"⛽ DOMINANT FUEL: {top_fuel['Fuel_Type']} ({top_fuel['Total_Sales']:,.0f} units)")
-print(f"🎨 TOP COLOR: {top_color}")
-print(f"💰 AVG PRICE: ${df['Price_USD'].mean():,.0f}")
-print(f"🔧 AUTOMATIC TRANSMISSION: {auto_pct:.1f}%")
-print(
-    f"📈 STRONGEST CORRELATION: Price vs Mileage ({df['Price_USD'].corr(df['Mileage_KM']):.3f})")
-
-print("\n" + "="*60)
-print("ANALYSIS COMPLETE")
-print("="*60)
-print(f"✅ Outputs saved in '{OUTPUT_DIR}' folder")
-print("📊 1. Excel: BMW_Sales_Comprehensive_Analysis.xlsx")
-print("📈 2. Interactive HTML Dashboard: BMW_Interactive_Dashboard.html")
-print("🖼️  3. Static Dashboard Image: BMW_Interactive_Dashboard.png (if kaleido installed)")
-print(
-    "📄 4. PDF Report: BMW_Sales_Analysis_Report_[timestamp].pdf (includes image)")
-print("🗃️  5. SQLite Database: BMW_Sales.db")
-print("="*60)
-
-conn.close()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,691 @@
+# =============================================================================
+# BMW SALES DATA ANALYSIS CORE
+# =============================================================================
+# Shared loading, cleaning, aggregation, statistics and reporting used by
+# the analysis suite and the enhanced-visuals script (bmw.py).
+# =============================================================================
+
+import pandas as pd
+import numpy as np
+import matplotlib
+import matplotlib.pyplot as plt
+import seaborn as sns
+import sqlite3
+import os
+from io import BytesIO
+from datetime import datetime
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
+from PIL import Image
+import warnings
+from scipy import stats
+
+# =========================
+# SETTINGS
+# =========================
+
+
+def configure_runtime():
+    """Process-wide warning, backend and plot-style setup for the scripts.
+
+    Called from the entry scripts' main() so importing this module leaves
+    the caller's warning filters and matplotlib state untouched.
+    """
+    # Surface warnings during development; pandas performance fallbacks fail
+    # loudly. Set BMW_SUPPRESS_WARNINGS=1 to silence everything in production.
+    if os.environ.get('BMW_SUPPRESS_WARNINGS') == '1':
+        warnings.filterwarnings('ignore')
+    else:
+        warnings.simplefilter('default')
+        warnings.filterwarnings('error', category=pd.errors.PerformanceWarning)
+
+    matplotlib.use('Agg')  # files only, never an interactive window
+    plt.style.use('seaborn-v0_8')
+    sns.set_palette("husl")
+
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(script_dir, "BMW_Sales_Analysis_Results")
+
+# Base filename (without extension)
+BASE_NAME = "BMW sales data (2010-2024) (1)"
+# Try with .csv first, then without
+CSV_FILE_CANDIDATES = [
+    os.path.join(script_dir, BASE_NAME + ".csv"),
+    os.path.join(script_dir, BASE_NAME)
+]
+
+DB_FILE = os.path.join(OUTPUT_DIR, "BMW_Sales.db")
+
+numeric_cols = ['Year', 'Engine_Size_L',
+                'Mileage_KM', 'Price_USD', 'Sales_Volume']
+category_cols = ['Model', 'Region', 'Fuel_Type',
+                 'Transmission', 'Color', 'Sales_Classification']
+# Final on-disk dtypes, handed straight to the CSV parser. Mileage and
+# price are whole numbers in the CSV, so they stay integers; engine size
+# stays float64 so its decimals are exact in every output.
+csv_dtypes = {'Year': 'int16', 'Engine_Size_L': 'float64',
+              'Mileage_KM': 'int32', 'Price_USD': 'int32',
+              'Sales_Volume': 'int32',
+              **{col: 'category' for col in category_cols}}
+# Bump whenever csv_dtypes or the parsing changes, so stale Parquet
+# caches written with the old schema are not reused
+CACHE_VERSION = 3
+
+
+def find_csv_file():
+    for candidate in CSV_FILE_CANDIDATES:
+        if os.path.exists(candidate):
+            return candidate
+
+    print("\n" + "="*60)
+    print("ERROR: BMW data file not found!")
+    print("="*60)
+    print(f"Expected one of:")
+    for c in CSV_FILE_CANDIDATES:
+        print(f"  {c}")
+    print("\nPlease copy your file to this folder and ensure it is named")
+    print(f"  {BASE_NAME}  or  {BASE_NAME}.csv")
+    print("="*60)
+    exit(1)
+
+# =========================
+# LOAD DATA
+# =========================
+
+
+def downcast_numeric(col):
+    kind = 'integer' if pd.api.types.is_integer_dtype(col) else 'float'
+    return pd.to_numeric(col, downcast=kind)
+
+
+def convert_to_parquet(csv_path, parquet_path):
+    # Parse the CSV once with its final dtypes and cache the result as Parquet
+    try:
+        df = pd.read_csv(csv_path, dtype=csv_dtypes, usecols=list(csv_dtypes),
+                         engine='c', low_memory=False)
+    except ValueError:
+        # Malformed or missing numbers: infer, then coerce and downcast
+        df = pd.read_csv(csv_path, usecols=list(csv_dtypes),
+                         dtype={col: 'category' for col in category_cols})
+        df[numeric_cols] = df[numeric_cols].apply(
+            pd.to_numeric, errors='coerce')
+        downcast_cols = [col for col in numeric_cols
+                         if csv_dtypes[col] != 'float64']
+        df[downcast_cols] = df[downcast_cols].apply(downcast_numeric)
+    try:
+        df.to_parquet(parquet_path, engine='pyarrow', compression='snappy')
+        print(f"✅ Parquet cache created: {parquet_path}")
+    except ImportError as e:
+        print(f"⚠️ Could not cache data as Parquet. Install pyarrow for this feature: pip install pyarrow")
+        print(f"   Error: {e}")
+    return df
+
+
+def load_or_cache(file_path):
+    print("\n1. DATA OVERVIEW")
+    print("-" * 40)
+    parquet_path = f"{file_path}.v{CACHE_VERSION}.parquet"
+    if (os.path.exists(parquet_path)
+            and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path)):
+        df = pd.read_parquet(parquet_path)
+    else:
+        df = convert_to_parquet(file_path, parquet_path)
+    print(f"Dataset shape: {df.shape}")
+    print(f"Total records: {df.shape[0]:,}")
+    print(f"Total sales volume: {df['Sales_Volume'].sum():,}")
+    return df
+
+# =========================
+# INITIAL CLEANING & METRICS
+# =========================
+
+
+def categorize_model(models):
+    if isinstance(models.dtype, pd.CategoricalDtype):
+        # Classify each distinct model once and broadcast through the codes;
+        # the trailing 'Other' is picked up by the -1 code of missing values
+        segments = categorize_model(pd.Series(models.cat.categories))
+        lookup = np.append(np.asarray(segments, dtype=object), 'Other')
+        return pd.Categorical(lookup[models.cat.codes.to_numpy()])
+    m = models.astype('string')
+    conds = [m.isna(), m.str.startswith('X'),
+             m.str.startswith('i'), m.str.startswith('M')]
+    conds = [c.to_numpy(dtype=bool, na_value=False) for c in conds]
+    choices = ['Other', 'SUV', 'i-Series', 'M-Series']
+    return pd.Categorical(np.select(conds, choices, default='Sedan'))
+
+
+def clean(df):
+    # Numeric columns are already coerced and downcast by load_or_cache
+
+    # Add derived metrics
+    # float32 buffers filled in place, so no intermediate Series are created
+    mk = df['Mileage_KM'].to_numpy(np.float32)
+    pu = df['Price_USD'].to_numpy(np.float32)
+    ppk = np.empty_like(pu)
+    np.add(mk, 1.0, out=ppk)  # avoid division by zero
+    np.divide(pu, ppk, out=ppk)
+    df['Price_per_KM'] = ppk
+    df['Vehicle_Age'] = downcast_numeric(2024 - df['Year'])
+
+    # Categorize model segments
+    df['Model_Segment'] = categorize_model(df['Model'])
+    return df
+
+
+def compute_metrics(df):
+    # Shared metrics, computed once and reused by the stats, PDF and summary
+    metrics = {}
+    metrics['total_sales'] = df['Sales_Volume'].sum()
+    metrics['avg_price'] = df['Price_USD'].mean()
+    metrics['corr_matrix'] = df[numeric_cols].corr()
+    metrics['price_mileage_corr'] = metrics['corr_matrix'].loc['Price_USD', 'Mileage_KM']
+    metrics['engine_by_year'] = df.groupby('Year')['Engine_Size_L'].mean()
+    metrics['color_counts'] = df['Color'].value_counts()
+    metrics['class_counts'] = df['Sales_Classification'].value_counts()
+    # Compare the int8 category codes rather than the labels
+    transmission = df['Transmission'].cat
+    auto_code = transmission.categories.get_indexer(['Automatic'])[0]
+    metrics['auto_pct'] = ((transmission.codes.to_numpy() == auto_code).mean() * 100
+                           if auto_code >= 0 else 0.0)
+    metrics['is_high'] = df['Sales_Classification'].values == 'High'
+    return metrics
+
+# =========================
+# SAVE RAW DATA & SQLITE DATABASE
+# =========================
+
+
+def storage_frame(df):
+    """Copy of df with a float64 Price_per_KM for files other tools query.
+
+    The float32 buffer stays in memory only: widened as-is it stores noise
+    such as 0.6506797671318054 instead of the exact ratio.
+    """
+    return df.assign(
+        Price_per_KM=df['Price_USD'].to_numpy(np.float64)
+        / (df['Mileage_KM'].to_numpy(np.float64) + 1))
+
+
+def save_raw_data(df, output_dir):
+    df = storage_frame(df)
+    raw_data_path = os.path.join(output_dir, "Raw_BMW_Data.parquet")
+    try:
+        df.to_parquet(raw_data_path, compression='snappy')
+    except ImportError:
+        raw_data_path = os.path.join(output_dir, "Raw_BMW_Data.csv.gz")
+        df.to_csv(raw_data_path, index=False)
+    print(f"\n✅ Raw data saved to {raw_data_path}")
+
+
+def save_to_sqlite(df, db_file):
+    conn = sqlite3.connect(db_file)
+    conn.executescript("""
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=OFF;
+        PRAGMA cache_size=-200000;
+        PRAGMA temp_store=MEMORY;
+    """)
+    df = storage_frame(df)
+    # Multi-row INSERTs, kept under SQLite's 32766 bound-variable limit
+    with conn:
+        df.to_sql('bmw_sales', conn, if_exists='replace', index=False,
+                  method='multi', chunksize=min(10_000, 32766 // len(df.columns)))
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_region_class ON bmw_sales(Region, Sales_Classification)")
+        conn.execute("CREATE INDEX IF NOT EXISTS ix_model ON bmw_sales(Model)")
+    conn.close()
+    print(f"✅ SQLite database created: {db_file}")
+
+# =========================
+# AGGREGATIONS FOR ANALYSIS
+# =========================
+
+
+def aggregate(df, metrics):
+    queries = {}
+
+    # Top 10 models by total sales
+    queries['top_models'] = df.groupby('Model', observed=True).agg(
+        Total_Sales=('Sales_Volume', 'sum'),
+        Avg_Price=('Price_USD', 'mean'),
+        Transaction_Count=('Model', 'size')
+    ).nlargest(10, 'Total_Sales').reset_index()
+
+    # Regional performance
+    queries['regional_performance'] = df.assign(
+        Is_High=metrics['is_high']
+    ).groupby('Region', observed=True).agg(
+        Total_Sales=('Sales_Volume', 'sum'),
+        Avg_Price=('Price_USD', 'mean'),
+        Avg_Engine=('Engine_Size_L', 'mean'),
+        Transaction_Count=('Region', 'size'),
+        High_Sales_Count=('Is_High', 'sum')
+    ).sort_values('Total_Sales', ascending=False).reset_index()
+
+    # Fuel type analysis
+    queries['fuel_analysis'] = df.groupby('Fuel_Type', observed=True).agg(
+        Total_Sales=('Sales_Volume', 'sum'),
+        Avg_Price=('Price_USD', 'mean'),
+        Transaction_Count=('Fuel_Type', 'size')
+    ).sort_values('Total_Sales', ascending=False).reset_index()
+
+    # Yearly trends
+    queries['yearly_trends'] = df.groupby('Year').agg(
+        Total_Sales=('Sales_Volume', 'sum'),
+        Avg_Price=('Price_USD', 'mean'),
+        Avg_Mileage=('Mileage_KM', 'mean'),
+        Avg_Engine=('Engine_Size_L', 'mean'),
+        Transaction_Count=('Year', 'size')
+    ).reset_index()
+
+    # Transmission preference by region: counts, and row percentages
+    # derived from them (wide, one column per transmission)
+    counts = pd.crosstab(df['Region'], df['Transmission'])
+    queries['transmission_counts'] = counts
+    queries['transmission_by_region'] = counts.div(
+        counts.sum(axis=1), axis=0).mul(100).round(2)
+
+    return queries
+
+# =========================
+# ADVANCED STATISTICAL ANALYSIS
+# =========================
+
+
+def perform_statistical_analysis(df, metrics):
+    print("\n\n8. CORRELATION ANALYSIS")
+    print("-" * 40)
+    corr_matrix = metrics['corr_matrix']
+    print("Correlation Matrix:")
+    print(corr_matrix.round(3))
+
+    # Price vs Mileage regression
+    x = df['Mileage_KM'].to_numpy(np.float32)
+    y = df['Price_USD'].to_numpy(np.float32)
+    dx = x - x.mean()
+    dy = y - y.mean()
+    sxx, syy = (dx * dx).sum(), (dy * dy).sum()
+    slope = (dx * dy).sum() / sxx
+    r_value = (dx * dy).sum() / np.sqrt(sxx * syy)
+    dof = x.size - 2
+    p_value = 2 * stats.t.sf(abs(r_value) * np.sqrt(dof / (1 - r_value**2)), dof)
+    print(f"\nRegression: Price vs Mileage")
+    print(f"R-squared: {r_value**2:.3f}")
+    print(f"P-value: {p_value:.4f}")
+    print(f"Slope: {slope:.3f} (price decrease per km)")
+
+    # T-test between High and Low sales classifications
+    print(f"\nT-test: High vs Low sales prices")
+    positions = df.groupby('Sales_Classification', observed=True).indices
+    high_pos, low_pos = positions.get('High'), positions.get('Low')
+    if high_pos is None or low_pos is None or min(high_pos.size, low_pos.size) < 2:
+        # e.g. a filtered extract with one class missing
+        print("→ Skipped: needs at least two rows in each of High and Low")
+    else:
+        price = df['Price_USD'].to_numpy(np.float32)
+        hp, lp = price[high_pos], price[low_pos]
+        hv, lv = hp.var(ddof=1) / hp.size, lp.var(ddof=1) / lp.size
+        t_stat = (hp.mean() - lp.mean()) / np.sqrt(hv + lv)
+        welch_dof = (hv + lv)**2 / (hv**2 / (hp.size - 1) + lv**2 / (lp.size - 1))
+        p_val = 2 * stats.t.sf(abs(t_stat), welch_dof)
+        print(f"T-statistic: {t_stat:.3f}, P-value: {p_val:.3f}")
+        if p_val < 0.05:
+            print("→ Significant difference in prices")
+        else:
+            print("→ No significant difference")
+
+    # Engine size trend
+    engine_trend = metrics['engine_by_year']
+    print(
+        f"\nEngine size trend (2010-2024): {engine_trend.iloc[0]:.2f}L → {engine_trend.iloc[-1]:.2f}L")
+
+
+def prepare(title):
+    """Load, clean, persist and analyse the data; shared by both entry scripts."""
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+
+    csv_file = find_csv_file()
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    df = clean(load_or_cache(csv_file))
+    metrics = compute_metrics(df)
+    save_raw_data(df, OUTPUT_DIR)
+    save_to_sqlite(df, DB_FILE)
+    queries = aggregate(df, metrics)
+    # Leading rows as plain dicts, read by the PDF and the final summary
+    metrics['top_model'] = queries['top_models'].iloc[0].to_dict()
+    metrics['top_region'] = queries['regional_performance'].iloc[0].to_dict()
+    metrics['top_fuel'] = queries['fuel_analysis'].iloc[0].to_dict()
+    perform_statistical_analysis(df, metrics)
+    return df, queries, metrics
+
+# =========================
+# STATIC VISUALIZATIONS
+# =========================
+
+
+def scatter_sample(df, n=5000):
+    """Row positions of the fixed random sample drawn in both dashboards.
+
+    Plotting every row dominates render time; a seeded uniform sample keeps
+    the shape of the price/mileage cloud and the same points every run.
+    """
+    return np.random.default_rng(0).choice(len(df), min(n, len(df)), replace=False)
+
+
+def save_png(fig, path, dpi):
+    """Render fig once to PNG bytes, write them to path and close fig."""
+    buf = BytesIO()
+    fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    png_bytes = buf.getvalue()
+    with open(path, 'wb') as f:
+        f.write(png_bytes)
+    return png_bytes
+
+
+def render_static(df, queries, metrics, output_dir):
+    print("\n\n10. GENERATING VISUALIZATIONS...")
+    print("-" * 40)
+    images = []
+
+    # Create main dashboard
+    fig = plt.figure(figsize=(20, 16))
+    fig.suptitle("BMW Sales Data Analysis Dashboard\n2010-2024",
+                 fontsize=20, fontweight='bold', y=0.98)
+
+    # 1. Top 10 Models by Sales Volume
+    ax1 = plt.subplot(3, 3, 1)
+    top_models = queries['top_models'].head(10)
+    bars = ax1.barh(top_models['Model'], top_models['Total_Sales'],
+                    color=plt.cm.viridis(np.linspace(0.2, 0.9, 10)))
+    ax1.set_title("Top 10 Models by Sales Volume", fontweight='bold')
+    ax1.set_xlabel("Total Sales")
+    ax1.invert_yaxis()
+    for i, (val, model) in enumerate(zip(top_models['Total_Sales'], top_models['Model'])):
+        ax1.text(val + 500, i, f"{val:,.0f}", va='center', fontsize=8)
+
+    # 2. Regional Market Share
+    ax2 = plt.subplot(3, 3, 2)
+    regional = queries['regional_performance']
+    ax2.pie(regional['Total_Sales'], labels=regional['Region'],
+            autopct='%1.1f%%', startangle=90)
+    ax2.set_title("Market Share by Region", fontweight='bold')
+
+    # 3. Fuel Type Distribution
+    ax3 = plt.subplot(3, 3, 3)
+    fuel = queries['fuel_analysis']
+    ax3.bar(fuel['Fuel_Type'], fuel['Total_Sales'], color=[
+            '#2E86AB', '#A23B72', '#F18F01', '#C73E1D'])
+    ax3.set_title("Sales by Fuel Type", fontweight='bold')
+    ax3.set_ylabel("Total Sales")
+    ax3.tick_params(axis='x', rotation=45)
+    for i, (val, typ) in enumerate(zip(fuel['Total_Sales'], fuel['Fuel_Type'])):
+        ax3.text(i, val + 500, f"{val:,.0f}", ha='center', fontsize=9)
+
+    # 4. Yearly Price Trend
+    ax4 = plt.subplot(3, 3, 4)
+    yearly = queries['yearly_trends']
+    ax4.plot(yearly['Year'], yearly['Avg_Price'],
+             marker='o', linewidth=2, color='#E63946')
+    ax4.set_title("Average Price Trend Over Years", fontweight='bold')
+    ax4.set_xlabel("Year")
+    ax4.set_ylabel("Avg Price (USD)")
+    ax4.grid(True, alpha=0.3)
+
+    # 5. Price vs Mileage Scatter
+    ax5 = plt.subplot(3, 3, 5)
+    idx = scatter_sample(df)
+    scatter = ax5.scatter(df['Mileage_KM'].values[idx], df['Price_USD'].values[idx],
+                          c=df['Year'].values[idx], cmap='viridis', alpha=0.6, s=20,
+                          rasterized=True)
+    ax5.set_title("Price vs Mileage (colored by Year)", fontweight='bold')
+    ax5.set_xlabel("Mileage (KM)")
+    ax5.set_ylabel("Price (USD)")
+    plt.colorbar(scatter, ax=ax5, label='Year')
+
+    # 6. Transmission Preference by Region (stacked bar)
+    ax6 = plt.subplot(3, 3, 6)
+    trans_pivot = queries['transmission_by_region']
+    trans_pivot.plot(kind='bar', stacked=True, ax=ax6, colormap='Paired')
+    ax6.set_title("Transmission Preference by Region", fontweight='bold')
+    ax6.set_ylabel("Percentage (%)")
+    ax6.legend(loc='upper right', bbox_to_anchor=(1.2, 1.0))
+    ax6.tick_params(axis='x', rotation=45)
+
+    # 7. Color Preferences (Top 6)
+    ax7 = plt.subplot(3, 3, 7)
+    color_counts = metrics['color_counts'].head(6)
+    ax7.bar(color_counts.index, color_counts.values, color=[
+            '#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b'])
+    ax7.set_title("Top 6 Color Preferences", fontweight='bold')
+    ax7.set_ylabel("Number of Vehicles")
+    for i, (col, cnt) in enumerate(zip(color_counts.index, color_counts.values)):
+        ax7.text(i, cnt + 5, f"{cnt}", ha='center', fontsize=9)
+
+    # 8. Engine Size Distribution by Model Segment
+    ax8 = plt.subplot(3, 3, 8)
+    sns.boxplot(data=df, x='Model_Segment', y='Engine_Size_L', ax=ax8,
+                hue='Model_Segment', palette='Set2', legend=False)
+    ax8.set_title("Engine Size by Model Segment", fontweight='bold')
+    ax8.set_ylabel("Engine Size (L)")
+    ax8.tick_params(axis='x', rotation=45)
+
+    # 9. Sales Classification Breakdown
+    ax9 = plt.subplot(3, 3, 9)
+    class_counts = metrics['class_counts']
+    ax9.pie(class_counts.values, labels=class_counts.index,
+            autopct='%1.1f%%', colors=['#66c2a5', '#fc8d62'])
+    ax9.set_title("High vs Low Sales Classification", fontweight='bold')
+
+    plt.tight_layout()
+    dashboard_path = os.path.join(output_dir, "BMW_Sales_Dashboard.png")
+    images.append((save_png(fig, dashboard_path, dpi=150),
+                   "COMPREHENSIVE DASHBOARD"))
+    print(f"✅ Dashboard saved: {dashboard_path}")
+
+    # Additional advanced visualizations
+    # Heatmap: Fuel Type by Region
+    fuel_region = pd.crosstab(
+        df['Region'], df['Fuel_Type'], normalize='index') * 100
+    fig = plt.figure(figsize=(10, 6))
+    sns.heatmap(fuel_region, annot=True, fmt='.1f', cmap='YlOrRd',
+                cbar_kws={'label': 'Percentage (%)'})
+    plt.title('Fuel Type Preference by Region (%)', fontweight='bold')
+    plt.tight_layout()
+    heatmap_path = os.path.join(output_dir, "Fuel_Region_Heatmap.png")
+    images.append((save_png(fig, heatmap_path, dpi=300),
+                   "FUEL TYPE PREFERENCE BY REGION"))
+    print(f"✅ Heatmap saved: {heatmap_path}")
+
+    # Boxplot: Price by Model Segment
+    plt.figure(figsize=(10, 6))
+    sns.boxplot(data=df, x='Model_Segment', y='Price_USD',
+                hue='Model_Segment', palette='Set3', legend=False)
+    plt.title('Price Distribution by Model Segment', fontweight='bold')
+    plt.xticks(rotation=45)
+    plt.tight_layout()
+    boxplot_path = os.path.join(output_dir, "Price_by_Segment.png")
+    plt.savefig(boxplot_path, dpi=300, bbox_inches='tight')
+    plt.close()
+    print(f"✅ Boxplot saved: {boxplot_path}")
+
+    # Dashboard and heatmap PNG bytes, embedded in the PDF without re-rendering
+    return images
+
+# =========================
+# EXCEL OUTPUTS (MULTI-SHEET)
+# =========================
+
+
+def save_excel(df, queries, metrics, output_dir):
+    excel_file = os.path.join(
+        output_dir, "BMW_Sales_Comprehensive_Analysis.xlsx")
+
+    # Summary statistics (numeric), plus a categorical summary built from
+    # value counts instead of describe(include='all'). Both are computed
+    # before the writer opens so it only does I/O. Described on the
+    # float64 storage frame so float32 noise stays out of the sheet.
+    summary_stats = storage_frame(df).describe()
+    cached_counts = {'Color': metrics['color_counts'],
+                     'Sales_Classification': metrics['class_counts']}
+    cat_summary = {}
+    for col in category_cols + ['Model_Segment']:
+        counts = cached_counts.get(col)
+        if counts is None:
+            counts = df[col].value_counts()
+        cat_summary[col] = {'count': counts.sum(), 'unique': (counts > 0).sum(),
+                            'top': counts.index[0], 'freq': counts.iloc[0]}
+    cat_summary = pd.DataFrame(cat_summary).T
+
+    # Long Region/Transmission/Count/Pct layout, busiest first per region
+    trans_long = pd.DataFrame({
+        'Count': queries['transmission_counts'].stack(),
+        'Pct': queries['transmission_by_region'].stack(),
+    }).reset_index().sort_values(['Region', 'Count'], ascending=[True, False])
+
+    with pd.ExcelWriter(excel_file, engine='xlsxwriter') as writer:
+        queries['top_models'].to_excel(
+            writer, sheet_name='Top_Models', index=False)
+        queries['regional_performance'].to_excel(
+            writer, sheet_name='Regional_Performance', index=False)
+        queries['fuel_analysis'].to_excel(
+            writer, sheet_name='Fuel_Analysis', index=False)
+        queries['yearly_trends'].to_excel(
+            writer, sheet_name='Yearly_Trends', index=False)
+        trans_long.to_excel(
+            writer, sheet_name='Transmission_by_Region', index=False)
+        summary_stats.to_excel(writer, sheet_name='Summary_Statistics')
+        cat_summary.to_excel(writer, sheet_name='Category_Summary')
+        metrics['corr_matrix'].to_excel(writer, sheet_name='Correlation_Matrix')
+
+    print(f"✅ Excel analysis saved: {excel_file}")
+
+# =========================
+# PROFESSIONAL PDF REPORT
+# =========================
+
+
+def pdf_page():
+    """A letter-size page kept out of pyplot's global figure manager."""
+    fig = Figure(figsize=(8.5, 11))
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+
+def image_page(pdf, img, title):
+    """Lay a PIL image out on a titled letter-size page."""
+    fig, ax = pdf_page()
+    ax.axis('off')
+    # No more pixels than the page shows at 200 dpi
+    img.thumbnail((1700, 2200))
+    ax.imshow(img, aspect='auto', extent=[0, 1, 0, 1])
+    ax.text(0.5, 0.95, title, fontsize=16,
+            fontweight='bold', ha='center', transform=ax.transAxes)
+    pdf.savefig(fig, bbox_inches='tight')
+
+
+def generate_pdf_report(df, metrics, output_dir, images=()):
+    """Write the PDF report.
+
+    images are (png_bytes, title) pairs, each laid out on its own page,
+    so charts are embedded from the bytes already rendered. A None png_bytes
+    (the render failed) skips its page with a warning, so an older file
+    on disk can never stand in for it.
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    pdf_path = os.path.join(
+        output_dir, f"BMW_Sales_Analysis_Report_{timestamp}.pdf")
+
+    with PdfPages(pdf_path) as pdf:
+        # Cover page
+        fig, ax = pdf_page()
+        ax.axis('off')
+        ax.add_patch(Rectangle((0, 0), 1, 1, color='#1a3b5c', alpha=0.9))
+        ax.text(0.5, 0.7, "BMW SALES DATA\nDEEP DIVE ANALYSIS", fontsize=24, fontweight='bold',
+                ha='center', color='white', linespacing=1.5)
+        ax.text(0.5, 0.5, "2010-2024", fontsize=18, ha='center', color='white')
+        ax.text(0.5, 0.3, f"Generated: {datetime.now().strftime('%B %d, %Y')}",
+                fontsize=12, ha='center', color='white')
+        pdf.savefig(fig, bbox_inches='tight')
+
+        # Executive Summary Page
+        fig, ax = pdf_page()
+        ax.axis('off')
+        ax.text(0.1, 0.9, "EXECUTIVE SUMMARY", fontsize=12, fontweight='bold',
+                va='top', transform=ax.transAxes)
+        summary_text = [
+            f"• Total Vehicles Analyzed: {len(df):,}",
+            f"• Total Sales Volume: {metrics['total_sales']:,}",
+            f"• Date Range: {df['Year'].min()} - {df['Year'].max()}",
+            f"• Average Price: ${metrics['avg_price']:,.0f}",
+            f"• Average Mileage: {df['Mileage_KM'].mean():,.0f} km",
+            f"• Top Model: {metrics['top_model']['Model']} ({metrics['top_model']['Total_Sales']:,.0f} units)",
+            f"• Top Region: {metrics['top_region']['Region']}",
+            f"• Dominant Fuel Type: {metrics['top_fuel']['Fuel_Type']}",
+            f"• Most Popular Color: {metrics['color_counts'].index[0]}",
+            "",
+            "KEY INSIGHTS:",
+            "• Strong negative correlation between price and mileage (R² ≈ 0.8)",
+            "• Automatic transmission dominates in all regions (>70%)",
+            "• SUVs (X-series) command highest prices and sales volumes",
+            "• Hybrid and Electric vehicles show increasing trend in later years"
+        ]
+        # One artist for the whole body; linespacing=2 keeps the 0.04 line step
+        ax.text(0.1, 0.83, "\n".join(summary_text), fontsize=12,
+                linespacing=2.0, va='top', transform=ax.transAxes)
+        pdf.savefig(fig, bbox_inches='tight')
+
+        # Pre-rendered chart images
+        for png_bytes, title in images:
+            if png_bytes is None:
+                print(f"⚠️ No image for '{title}', skipping in PDF.")
+                continue
+            # stays uint8, unlike plt.imread
+            image_page(pdf, Image.open(BytesIO(png_bytes)), title)
+
+    print(f"✅ PDF report generated: {pdf_path}")
+
+# =========================
+# FINAL SUMMARY
+# =========================
+
+
+def print_summary(df, metrics, outputs):
+    print("\n" + "="*60)
+    print("KEY FINDINGS SUMMARY")
+    print("="*60)
+
+    top_model = metrics['top_model']
+    top_region = metrics['top_region']
+    top_fuel = metrics['top_fuel']
+    top_color = metrics['color_counts'].index[0]
+    auto_pct = metrics['auto_pct']
+
+    print(f"📊 TOTAL VEHICLES: {len(df):,}")
+    print(f"💰 TOTAL SALES VOLUME: {metrics['total_sales']:,}")
+    print(
+        f"🏆 TOP MODEL: {top_model['Model']} ({top_model['Total_Sales']:,.0f} units)")
+    print(
+        f"🌎 TOP REGION: {top_region['Region']} ({top_region['Total_Sales']:,.0f} units)")
+    print(
+        f"⛽ DOMINANT FUEL: {top_fuel['Fuel_Type']} ({top_fuel['Total_Sales']:,.0f} units)")
+    print(f"🎨 TOP COLOR: {top_color}")
+    print(f"💰 AVG PRICE: ${metrics['avg_price']:,.0f}")
+    print(f"🔧 AUTOMATIC TRANSMISSION: {auto_pct:.1f}%")
+    print(
+        f"📈 STRONGEST CORRELATION: Price vs Mileage ({metrics['price_mileage_corr']:.3f})")
+
+    print("\n" + "="*60)
+    print("ANALYSIS COMPLETE")
+    print("="*60)
+    print(f"✅ Outputs saved in '{OUTPUT_DIR}' folder")
+    for line in outputs:
+        print(line)
+    print("="*60)